@@ -0,0 +1,82 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Compiled BMP180 pressure compensation, used by data_logger.py when built
+
+Build in place with setup.sh, or by hand:
+    CFLAGS="-O3 -march=native" cythonize -i _bmp180.pyx
+"""
+from libc.stdint cimport int16_t, uint16_t, int32_t, int64_t
+
+# Calibration values in the sensor's ROM order
+cdef struct Bmp180Cal:
+    int16_t AC1, AC2, AC3
+    uint16_t AC4, AC5, AC6
+    int16_t B1, B2, MB, MC, MD
+
+cdef class Calibration:
+    """BMP180 calibration values (AC1..MD) held in a fixed-layout struct"""
+    cdef Bmp180Cal cal
+
+    def __init__(self, AC1, AC2, AC3, AC4, AC5, AC6, B1, B2, MB, MC, MD):
+        self.cal.AC1 = AC1
+        self.cal.AC2 = AC2
+        self.cal.AC3 = AC3
+        self.cal.AC4 = AC4
+        self.cal.AC5 = AC5
+        self.cal.AC6 = AC6
+        self.cal.B1 = B1
+        self.cal.B2 = B2
+        self.cal.MB = MB
+        self.cal.MC = MC
+        self.cal.MD = MD
+
+cdef inline int64_t floordiv(int64_t a, int64_t b) nogil:
+    """Integer division rounding down, like Python's //"""
+    cdef int64_t q = a / b
+    if a % b != 0 and (a < 0) != (b < 0):
+        q -= 1
+    return q
+
+cdef double _compute(const Bmp180Cal *cal, int64_t UT, int64_t UP, int oversample) except? -1.0 nogil:
+    # Same steps as data_logger._bmp180_compute; >> on negative values is an
+    # arithmetic shift with gcc/clang, matching Python
+    cdef int64_t X1, X2, X3, B3, B4, B5, B6, B7, P
+
+    # Calculate true temperature (needed for pressure calculation)
+    X1 = ((UT - cal.AC6) * cal.AC5) >> 15
+    if X1 + cal.MD == 0:
+        with gil:
+            raise ZeroDivisionError("BMP180 temperature divisor is zero")
+    X2 = (<int64_t>cal.MC * 2048) / (X1 + cal.MD)  # Truncates like int(a / b)
+    B5 = X1 + X2
+
+    # Calculate true pressure
+    B6 = B5 - 4000
+    X1 = (cal.B2 * ((B6 * B6) >> 12)) >> 11
+    X2 = (cal.AC2 * B6) >> 11
+    X3 = X1 + X2
+    B3 = (((cal.AC1 * 4 + X3) << oversample) + 2) >> 2
+    X1 = (cal.AC3 * B6) >> 13
+    X2 = (cal.B1 * ((B6 * B6) >> 12)) >> 16
+    X3 = ((X1 + X2) + 2) >> 2
+    B4 = (cal.AC4 * (X3 + 32768)) >> 15
+    B7 = (UP - B3) * (50000 >> oversample)
+    if B4 == 0:
+        with gil:
+            raise ZeroDivisionError("BMP180 pressure divisor is zero")
+
+    if B7 < 0x80000000LL:
+        P = floordiv(B7 * 2, B4)
+    else:
+        P = floordiv(B7, B4) * 2
+
+    X1 = (P >> 8) * (P >> 8)
+    X1 = (X1 * 3038) >> 16
+    X2 = (-7357 * P) >> 16
+    return (P + ((X1 + X2 + 3791) >> 4)) / 100.0  # Convert to hPa
+
+def compute_pressure(Calibration cal, int32_t UT, int32_t UP, int oversample):
+    """Compensate raw BMP180 readings and return pressure in hPa"""
+    cdef double pressure
+    with nogil:
+        pressure = _compute(&cal.cal, UT, UP, oversample)
+    return pressure
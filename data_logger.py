@@ -1,24 +1,96 @@
 import smbus
 import time
-from ctypes import c_short
+import asyncio
+import ctypes
+import errno
+import fcntl
+import functools
+import inspect
 import signal
+import struct
 import sys
 import adafruit_dht
-import board
 import spidev
 import csv
 import os
 import json
 import logging
+import mmap
+import queue
+import threading
+from collections import namedtuple
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the BMP180 maths runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+try:
+    # Compiled BMP180 maths, built from _bmp180.pyx by setup.sh
+    import _bmp180
+except ImportError:
+    _bmp180 = None
+
 # Load configuration
 def load_config():
     config_path = Path(__file__).parent / 'sensor_logger.json'
     with open(config_path, 'r') as f:
         return json.load(f)
 
+# Validation settings, flattened once so the sampling loop avoids nested lookups
+Limits = namedtuple('Limits', [
+    'temp_min', 'temp_max',
+    'hum_min', 'hum_max',
+    'soil_min', 'soil_max',
+    'pres_min', 'pres_max',
+    'light_min', 'light_max',
+    'rain_min', 'rain_max',
+])
+ValidationConfig = namedtuple('ValidationConfig', ['enabled', 'limits'])
+RetryConfig = namedtuple('RetryConfig', ['timeout', 'retries'])
+SensorWorkers = namedtuple('SensorWorkers', ['analog', 'dht22'])
+
+def load_validation(config):
+    """Build the validation settings from the loaded configuration"""
+    limits = config['validation']['limits']
+    return ValidationConfig(
+        enabled=config['validation']['enabled'],
+        limits=Limits(
+            temp_min=limits['temperature']['min'], temp_max=limits['temperature']['max'],
+            hum_min=limits['humidity']['min'], hum_max=limits['humidity']['max'],
+            soil_min=limits['soil_moisture']['min'], soil_max=limits['soil_moisture']['max'],
+            pres_min=limits['pressure']['min'], pres_max=limits['pressure']['max'],
+            light_min=limits['light']['min'], light_max=limits['light']['max'],
+            rain_min=limits['rain']['min'], rain_max=limits['rain']['max'],
+        ),
+    )
+
+def load_retry(config):
+    """Build the per-sensor timeout and retry settings from the loaded configuration"""
+    return RetryConfig(
+        timeout=config['logger'].get('sensor_timeout', DEFAULT_SENSOR_TIMEOUT),
+        retries=config['logger'].get('sensor_retries', DEFAULT_SENSOR_RETRIES),
+    )
+
+# Timestamp formatting
+DATETIME_ONLY_DIRECTIVES = ('%f', '%z', '%Z', '%:')  # Handled differently by time.strftime
+
+def make_timestamp_formatter(timestamp_format):
+    """Return a function that formats the current local time with timestamp_format"""
+    if not any(directive in timestamp_format for directive in DATETIME_ONLY_DIRECTIVES):
+        # time.strftime formats straight from the C time struct, skipping the
+        # datetime object and its format preprocessing
+        def format_timestamp():
+            return time.strftime(timestamp_format)
+    else:
+        def format_timestamp():
+            return datetime.now().strftime(timestamp_format)
+    return format_timestamp
+
 # Initialize logging
 def setup_logging(config):
     log_level = getattr(logging, config['logger']['log_level'])
@@ -49,16 +121,47 @@ def initialize_hardware():
         logging.error(f"Error initializing DHT22: {e}")
         raise
     
-    # I2C setup for BMP180
+    # I2C setup for BMP180; its calibration data is read on the first reading
     bus = smbus.SMBus(1)  # Use I2C bus 1 on Raspberry Pi
+    bmp = Bmp180(bus)
     
-    return spi, dht_sensor, bus
+    return spi, dht_sensor, bmp
 
 # Channel definitions
 MOISTURE_CHANNEL = 0 
 LDR_CHANNEL = 1
 RAIN_CHANNEL = 2
 
+# CSV buffering
+CSV_BUFFER_SIZE = 8192       # Bytes buffered before the file is written out
+DEFAULT_FLUSH_INTERVAL = 1   # Seconds between flushes of buffered rows
+CSV_QUEUE_SIZE = 1024        # Rows held for the writer thread before dropping
+CSV_BATCH_SIZE = 32          # Rows collected by the writer thread per writerows call
+CSV_STOP_TIMEOUT = 5         # Seconds shutdown waits on the writer thread
+DIRECT_IO_BLOCK_SIZE = 4096  # Alignment for O_DIRECT offsets and write sizes
+IO_URING_BATCH_SIZE = 32     # Rows submitted to io_uring per system call
+FALLOC_FL_KEEP_SIZE = 0x01   # fallocate(2) flag: reserve blocks without growing the file
+
+# CSV header, and a typical row after the timestamp used to size the daily
+# preallocation; unrounded percentages and altitudes print up to 18 digits
+CSV_HEADERS = [
+    'Timestamp',
+    'Temperature (°C)',
+    'Humidity (%)',
+    'Soil Moisture (%)',
+    'Light Level (%)',
+    'Rain Level (%)',
+    'Pressure (hPa)',
+    'Altitude (m)'
+]
+CSV_SAMPLE_VALUES = [21.5, 45.2, 100 / 3, 100 / 3, 100 / 3, 1013.25, 100 / 3]
+
+# Sensor read timeouts and retries
+DEFAULT_SENSOR_TIMEOUT = 2   # Seconds allowed for a single sensor read attempt
+DEFAULT_SENSOR_RETRIES = 3   # Attempts per sensor when a read fails transiently
+SENSOR_RETRY_DELAY = 0.1     # Seconds between attempts
+DHT22_RETRY_DELAY = 2.0      # adafruit_dht returns its cached values if read again within 2 s
+
 # BMP180 constants
 DEVICE = 0x77  # I2C address of BMP180 sensor
 
@@ -75,48 +178,149 @@ LDR_MAX = 1023   # ADC value in bright light (3.3V)
 RAIN_DRY_VALUE = 1023   # Value when sensor is completely dry
 RAIN_WET_VALUE = 300    # Value when sensor is wet
 
+# Percent per ADC count for each channel, so a reading is one multiply; each
+# maps linearly from its high value (0%) down to its low value (100%)
+SOIL_SCALE = 100.0 / (SOIL_DRY_VALUE - SOIL_WET_VALUE)
+LDR_SCALE = 100.0 / (LDR_MAX - LDR_MIN)
+RAIN_SCALE = 100.0 / (RAIN_DRY_VALUE - RAIN_WET_VALUE)
+
+# Single-ended request frames for MCP3008 channels 0-7, built once. They are
+# tuples because xfer2 writes the received bytes back into a list argument,
+# which would replace the start bit; a tuple is copied and a new one returned
+ADC_REQUESTS = tuple((1, (8 + channel) << 4, 0) for channel in range(8))
+
 # ADC reading functions
 def read_adc(spi, channel):
     """Read the analog value from the MCP3008 ADC"""
-    adc_request = [1, (8 + channel) << 4, 0]
-    adc_response = spi.xfer2(adc_request)
+    adc_response = spi.xfer2(ADC_REQUESTS[channel])
     return ((adc_response[1] & 3) << 8) + adc_response[2]
 
-# Soil moisture functions
-def calculate_moisture_percentage(value):
-    """Convert ADC value to moisture percentage"""
-    value = max(min(value, SOIL_DRY_VALUE), SOIL_WET_VALUE)
-    return ((SOIL_DRY_VALUE - value) / (SOIL_DRY_VALUE - SOIL_WET_VALUE)) * 100
+# struct spi_ioc_transfer from <linux/spi/spidev.h>
+class SpiIocTransfer(ctypes.Structure):
+    _fields_ = [
+        ('tx_buf', ctypes.c_uint64),
+        ('rx_buf', ctypes.c_uint64),
+        ('len', ctypes.c_uint32),
+        ('speed_hz', ctypes.c_uint32),
+        ('delay_usecs', ctypes.c_uint16),
+        ('bits_per_word', ctypes.c_uint8),
+        ('cs_change', ctypes.c_uint8),
+        ('tx_nbits', ctypes.c_uint8),
+        ('rx_nbits', ctypes.c_uint8),
+        ('word_delay_usecs', ctypes.c_uint8),
+        ('pad', ctypes.c_uint8),
+    ]
 
-# Light sensor functions
-def convert_to_percent(value, min_val, max_val):
-    """Convert raw ADC value to percentage"""
-    percent = ((max_val - value) / (max_val - min_val)) * 100
-    return max(0, min(100, percent))  # Clamp values to 0-100% range
+def spi_ioc_message(count):
+    """Return the SPI_IOC_MESSAGE(count) ioctl request number"""
+    # _IOW('k', 0, char[count * sizeof(struct spi_ioc_transfer)])
+    return (1 << 30) | ((count * ctypes.sizeof(SpiIocTransfer)) << 16) | (ord('k') << 8)
 
-# Rain sensor functions
-def calculate_wetness_percentage(value):
-    """Convert ADC value to wetness percentage"""
-    value = max(min(value, RAIN_DRY_VALUE), RAIN_WET_VALUE)
-    return ((RAIN_DRY_VALUE - value) / (RAIN_DRY_VALUE - RAIN_WET_VALUE)) * 100
+@functools.lru_cache(maxsize=None)
+def _adc_batch_message(channels):
+    """Build the transfer list and buffers for reading channels, once per channel set"""
+    tx = (ctypes.c_uint8 * (3 * len(channels)))(*[b for channel in channels for b in ADC_REQUESTS[channel]])
+    rx = (ctypes.c_uint8 * (3 * len(channels)))()
+    transfers = (SpiIocTransfer * len(channels))()
+    for i, transfer in enumerate(transfers):
+        transfer.tx_buf = ctypes.addressof(tx) + 3 * i
+        transfer.rx_buf = ctypes.addressof(rx) + 3 * i
+        transfer.len = 3
+        # Release CS after each frame but the last so every frame starts a conversion
+        transfer.cs_change = 1 if i < len(channels) - 1 else 0
+    return spi_ioc_message(len(channels)), transfers, tx, rx
 
-# BMP180 helper functions
-def getShort(data, index):
-    """Combine two bytes and return signed 16-bit value"""
-    return c_short((data[index] << 8) + data[index + 1]).value
+def read_adc_batch(spi, channels=(MOISTURE_CHANNEL, LDR_CHANNEL, RAIN_CHANNEL)):
+    """Read several MCP3008 channels in one pass and return their raw values"""
+    # The MCP3008 only starts a new conversion on a falling CS edge, so the
+    # 3-byte frames can't be packed into one xfer2 buffer (CS stays low for
+    # the whole buffer). Instead they go out as separate transfers of one
+    # SPI_IOC_MESSAGE ioctl, with CS toggled between them.
+    channels = tuple(channels)
+    request, transfers, tx, rx = _adc_batch_message(channels)
+    try:
+        fcntl.ioctl(spi.fileno(), request, transfers)
+    except AttributeError:
+        # Older spidev without fileno()
+        return tuple(read_adc(spi, channel) for channel in channels)
+    except OSError as e:
+        # Not a kernel spidev device; real I/O errors go to the caller's retries
+        if e.errno not in (errno.ENOTTY, errno.EINVAL):
+            raise
+        return tuple(read_adc(spi, channel) for channel in channels)
+    return tuple(((rx[3 * i + 1] & 3) << 8) + rx[3 * i + 2] for i in range(len(channels)))
+
+# Analog sensor calibration
+def calculate_percentages(raw_values):
+    """Convert (soil, LDR, rain) ADC values to moisture, light and wetness percentages"""
+    # Plain float maths: for three values it is faster than building NumPy
+    # arrays, and keeps full double precision
+    soil_raw, ldr_raw, rain_raw = raw_values
+    soil_raw = max(min(soil_raw, SOIL_DRY_VALUE), SOIL_WET_VALUE)
+    ldr_raw = max(min(ldr_raw, LDR_MAX), LDR_MIN)
+    rain_raw = max(min(rain_raw, RAIN_DRY_VALUE), RAIN_WET_VALUE)
+    return ((SOIL_DRY_VALUE - soil_raw) * SOIL_SCALE,
+            (LDR_MAX - ldr_raw) * LDR_SCALE,
+            (RAIN_DRY_VALUE - rain_raw) * RAIN_SCALE)
 
-def getUshort(data, index):
-    """Combine two bytes and return unsigned 16-bit value"""
-    return (data[index] << 8) + data[index + 1]
+# Altitude from pressure
+SEA_LEVEL_PRESSURE = 1013.25                # hPa
+ALTITUDE_PRESSURE_SCALE = 1.0 / SEA_LEVEL_PRESSURE
+ALTITUDE_EXPONENT = 1.0 / 5.255
 
+def calculate_altitude(pressure):
+    """Convert pressure in hPa to altitude in metres with the barometric formula"""
+    return 44330.0 * (1.0 - (pressure * ALTITUDE_PRESSURE_SCALE) ** ALTITUDE_EXPONENT)
+
+# BMP180 helper functions
 def readBmp180Id(bus, addr=DEVICE):
     """Read chip ID and version from the sensor"""
     REG_ID = 0xD0
     (chip_id, chip_version) = bus.read_i2c_block_data(addr, REG_ID, 2)
     return (chip_id, chip_version)
 
-def readBmp180(bus, addr=DEVICE):
-    """Read pressure from BMP180 sensor"""
+@njit(cache=True, fastmath=False)
+def _bmp180_compute(UT, UP, AC1, AC2, AC3, AC4, AC5, AC6, B1, B2, MB, MC, MD, OVERSAMPLE):
+    """Compensate raw BMP180 readings and return pressure in hPa"""
+    # Calculate true temperature (needed for pressure calculation)
+    X1 = ((UT - AC6) * AC5) >> 15
+    X2 = int((MC << 11) / (X1 + MD))
+    B5 = X1 + X2
+
+    # Calculate true pressure
+    B6 = B5 - 4000
+    X1 = (B2 * (B6 * B6 >> 12)) >> 11
+    X2 = (AC2 * B6) >> 11
+    X3 = X1 + X2
+    B3 = (((AC1 * 4 + X3) << OVERSAMPLE) + 2) >> 2
+    X1 = (AC3 * B6) >> 13
+    X2 = (B1 * (B6 * B6 >> 12)) >> 16
+    X3 = ((X1 + X2) + 2) >> 2
+    B4 = (AC4 * (X3 + 32768)) >> 15
+    B7 = (UP - B3) * (50000 >> OVERSAMPLE)
+
+    if B7 < 0x80000000:
+        P = (B7 * 2) // B4
+    else:
+        P = (B7 // B4) * 2
+
+    X1 = (P >> 8) * (P >> 8)
+    X1 = (X1 * 3038) >> 16
+    X2 = (-7357 * P) >> 16
+    pressure = P + ((X1 + X2 + 3791) >> 4)
+    return pressure / 100.0  # Convert to hPa
+
+def warm_up_bmp180():
+    """Compile the BMP180 maths ahead of the first reading"""
+    if _bmp180 is not None:
+        return  # The Cython extension is used instead, nothing to compile
+    # Datasheet example values, so the JIT cost isn't paid in the logging loop
+    _bmp180_compute(27898, 23843, 408, -72, -14383, 32741, 32757, 23153,
+                    6190, 4, -32768, -8711, 2868, 0)
+
+class Bmp180:
+    """BMP180 pressure sensor with its calibration data cached after the first read"""
+
     # Register addresses
     REG_CALIB  = 0xAA
     REG_MEAS   = 0xF4
@@ -126,196 +330,658 @@ def readBmp180(bus, addr=DEVICE):
     CRV_PRES   = 0x34
     OVERSAMPLE = 3  # Oversampling setting (0-3)
 
-    try:
-        # Read calibration data from the sensor
-        cal = bus.read_i2c_block_data(addr, REG_CALIB, 22)
-
-        # Convert bytes to calibration values
-        AC1 = getShort(cal, 0)
-        AC2 = getShort(cal, 2)
-        AC3 = getShort(cal, 4)
-        AC4 = getUshort(cal, 6)
-        AC5 = getUshort(cal, 8)
-        AC6 = getUshort(cal, 10)
-        B1  = getShort(cal, 12)
-        B2  = getShort(cal, 14)
-        MB  = getShort(cal, 16)
-        MC  = getShort(cal, 18)
-        MD  = getShort(cal, 20)
+    def __init__(self, bus, addr=DEVICE):
+        self.bus = bus
+        self.addr = addr
+        self.worker = SensorWorker('bmp180')
+        # Read on first use, so an I2C error at boot only costs that reading
+        self.calibration = None
+        self._compiled_cal = None
+
+    async def _read_cal(self):
+        """Read the factory calibration values (AC1..MD) from the sensor ROM"""
+        cal = await self.worker.call(self.bus.read_i2c_block_data, self.addr, self.REG_CALIB, 22)
+
+        # Convert big-endian bytes to AC1..AC3 (signed), AC4..AC6 (unsigned)
+        # and B1, B2, MB, MC, MD (signed)
+        return struct.unpack_from('>hhhHHHhhhhh', bytes(cal), 0)
+
+    async def read_pressure(self):
+        """Read pressure from the sensor in hPa"""
+        bus, addr, call = self.bus, self.addr, self.worker.call
+
+        # Load the calibration until a read succeeds; a failure raises and
+        # leaves it unset, so it is tried again with the next reading
+        if self.calibration is None:
+            calibration = await self._read_cal()
+            if _bmp180 is not None:
+                self._compiled_cal = _bmp180.Calibration(*calibration)
+            self.calibration = calibration
 
         # Request temperature measurement (needed for pressure calculation)
-        bus.write_byte_data(addr, REG_MEAS, CRV_TEMP)
-        time.sleep(0.005)  # Wait for measurement
-        msb, lsb = bus.read_i2c_block_data(addr, REG_MSB, 2)
+        await call(bus.write_byte_data, addr, self.REG_MEAS, self.CRV_TEMP)
+        await asyncio.sleep(0.005)  # Wait for measurement
+        msb, lsb = await call(bus.read_i2c_block_data, addr, self.REG_MSB, 2)
         UT = (msb << 8) + lsb
 
         # Request pressure measurement
-        bus.write_byte_data(addr, REG_MEAS, CRV_PRES + (OVERSAMPLE << 6))
-        time.sleep(0.04)  # Wait for measurement
-        msb, lsb, xsb = bus.read_i2c_block_data(addr, REG_MSB, 3)
-        UP = ((msb << 16) + (lsb << 8) + xsb) >> (8 - OVERSAMPLE)
-
-        # Calculate true temperature (needed for pressure calculation)
-        X1 = ((UT - AC6) * AC5) >> 15
-        X2 = int((MC << 11) / (X1 + MD))
-        B5 = X1 + X2
-
-        # Calculate true pressure
-        B6 = B5 - 4000
-        X1 = (B2 * (B6 * B6 >> 12)) >> 11
-        X2 = (AC2 * B6) >> 11
-        X3 = X1 + X2
-        B3 = (((AC1 * 4 + X3) << OVERSAMPLE) + 2) >> 2
-        X1 = (AC3 * B6) >> 13
-        X2 = (B1 * (B6 * B6 >> 12)) >> 16
-        X3 = ((X1 + X2) + 2) >> 2
-        B4 = (AC4 * (X3 + 32768)) >> 15
-        B7 = (UP - B3) * (50000 >> OVERSAMPLE)
-
-        if B7 < 0x80000000:
-            P = (B7 * 2) // B4
-        else:
-            P = (B7 // B4) * 2
-
-        X1 = (P >> 8) * (P >> 8)
-        X1 = (X1 * 3038) >> 16
-        X2 = (-7357 * P) >> 16
-        pressure = P + ((X1 + X2 + 3791) >> 4)
-        pressure = pressure / 100.0  # Convert to hPa
+        await call(bus.write_byte_data, addr, self.REG_MEAS,
+                   self.CRV_PRES + (self.OVERSAMPLE << 6))
+        await asyncio.sleep(0.04)  # Wait for measurement
+        msb, lsb, xsb = await call(bus.read_i2c_block_data, addr, self.REG_MSB, 3)
+        UP = ((msb << 16) + (lsb << 8) + xsb) >> (8 - self.OVERSAMPLE)
 
-        return pressure
-    except Exception as e:
-        logging.error(f"Error reading BMP180 sensor: {e}")
-        return None
+        if self._compiled_cal is not None:
+            return _bmp180.compute_pressure(self._compiled_cal, UT, UP, self.OVERSAMPLE)
+        return _bmp180_compute(UT, UP, *self.calibration, self.OVERSAMPLE)
 
-# Read DHT22 sensor with error handling
+# Read DHT22 sensor
 def read_dht22(dht_sensor):
     """Read temperature and humidity from DHT22 sensor"""
-    try:
-        temperature = dht_sensor.temperature
-        humidity = dht_sensor.humidity
-        return (temperature, humidity)
-    except Exception as e:
-        logging.error(f"Error reading DHT22 sensor: {e}")
-        return (None, None)
+    temperature = dht_sensor.temperature
+    humidity = dht_sensor.humidity
+    return (temperature, humidity)
 
-# Read all sensors
-def read_all_sensors(spi, dht_sensor, bus, config):
-    """Read all sensor values and validate them"""
-    # Read soil moisture
-    try:
-        soil_raw = read_adc(spi, MOISTURE_CHANNEL)
-        soil_moisture = calculate_moisture_percentage(soil_raw)
-    except Exception as e:
-        logging.error(f"Error reading soil moisture sensor: {e}")
-        soil_moisture = None
+# Read analog sensors
+def read_analog_sensors(spi):
+    """Read soil moisture, light level and rain sensor in one ADC pass"""
+    return calculate_percentages(read_adc_batch(spi))
 
-    # Read light level
-    try:
-        ldr_raw = read_adc(spi, LDR_CHANNEL)
-        light_level = convert_to_percent(ldr_raw, LDR_MIN, LDR_MAX)
-    except Exception as e:
-        logging.error(f"Error reading light sensor: {e}")
-        light_level = None
+# Bounded sensor reads
+def _resolve(future, setter, value):
+    if not future.done():
+        setter(value)
 
-    # Read rain sensor
-    try:
-        rain_raw = read_adc(spi, RAIN_CHANNEL)
-        rain_level = calculate_wetness_percentage(rain_raw)
-    except Exception as e:
-        logging.error(f"Error reading rain sensor: {e}")
-        rain_level = None
+class SensorWorker(threading.Thread):
+    """Daemon thread running one sensor's blocking calls, one at a time
+
+    A call that hangs in a driver keeps only this sensor's thread busy, so it
+    can't starve the other sensors or overlap with the next read of the same
+    device, and being a daemon thread it doesn't hold up shutdown.
+    """
 
-    # Read temperature and humidity from DHT22
-    temperature, humidity = read_dht22(dht_sensor)
+    def __init__(self, name):
+        super().__init__(name=f'sensor-{name}', daemon=True)
+        self._jobs = queue.SimpleQueue()
+        self._idle = threading.Event()
+        self._idle.set()
+        self.start()
+
+    def busy(self):
+        """Whether a previous call (e.g. one that timed out) is still running"""
+        return not self._idle.is_set()
+
+    def call(self, fn, *args):
+        """Run fn(*args) on this thread and return a future for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._idle.clear()
+        self._jobs.put((loop, future, fn, args))
+        return future
+
+    def run(self):
+        while True:
+            loop, future, fn, args = self._jobs.get()
+            try:
+                outcome = (future.set_result, fn(*args))
+            except Exception as e:
+                outcome = (future.set_exception, e)
+            self._idle.set()
+            try:
+                loop.call_soon_threadsafe(_resolve, future, *outcome)
+            except RuntimeError:
+                pass  # Event loop already closed during shutdown
 
-    # Read pressure sensor
-    pressure = readBmp180(bus)
+async def with_timeout(name, fn, worker, timeout_s, retries=DEFAULT_SENSOR_RETRIES,
+                       retry_delay=SENSOR_RETRY_DELAY, retry_on=(RuntimeError,)):
+    """Run a sensor read with a timeout, retrying transient failures
+
+    fn is either a coroutine function that does its blocking calls on worker,
+    or a blocking callable run on worker. Returns None if worker is still busy
+    with an earlier read, the read times out, keeps raising one of retry_on for
+    every attempt, or fails with any other error.
+    """
+    if worker.busy():
+        logging.warning(f"{name} still busy with an earlier read, skipping this cycle")
+        return None
+    for attempt in range(1, retries + 1):
+        if inspect.iscoroutinefunction(fn):
+            pending = fn()
+        else:
+            pending = worker.call(fn)
+        try:
+            return await asyncio.wait_for(pending, timeout_s)
+        except asyncio.TimeoutError:
+            # A stuck driver call can't be interrupted; give up on this cycle
+            logging.error(f"Timed out reading {name} after {timeout_s}s")
+            return None
+        except retry_on as e:
+            # Transient failure (e.g. a DHT22 checksum or I2C remote I/O error)
+            if attempt == retries:
+                logging.error(f"Error reading {name} after {retries} attempts: {e}")
+                return None
+            logging.debug(f"Retrying {name} read: {e}")
+            await asyncio.sleep(retry_delay)
+        except Exception as e:
+            logging.error(f"Error reading {name}: {e}")
+            return None
+
+# Read all sensors
+async def read_all_sensors(spi, dht_sensor, bmp, validation, format_timestamp, retry, workers):
+    """Read all sensor values concurrently and validate them"""
+    # The BMP180 conversion waits overlap with the blocking DHT22 and SPI reads
+    analog, dht, pressure = await asyncio.gather(
+        with_timeout('analog sensors', lambda: read_analog_sensors(spi), workers.analog,
+                     retry.timeout, retry.retries, retry_on=(RuntimeError, OSError)),
+        with_timeout('DHT22 sensor', lambda: read_dht22(dht_sensor), workers.dht22,
+                     retry.timeout, retry.retries, DHT22_RETRY_DELAY),
+        with_timeout('BMP180 sensor', bmp.read_pressure, bmp.worker,
+                     retry.timeout, retry.retries, retry_on=(RuntimeError, OSError)),
+    )
+    soil_moisture, light_level, rain_level = analog or (None, None, None)
+    temperature, humidity = dht or (None, None)
 
     # Validate readings if enabled
-    if config['validation']['enabled']:
-        limits = config['validation']['limits']
-        
-        # Validate temperature (DHT22 only)
-        if temperature is not None:
-            if not (limits['temperature']['min'] <= temperature <= limits['temperature']['max']):
-                logging.warning(f"Temperature {temperature}°C outside valid range")
-        
-        # Validate humidity
-        if humidity is not None:
-            if not (limits['humidity']['min'] <= humidity <= limits['humidity']['max']):
-                logging.warning(f"Humidity {humidity}% outside valid range")
-        
-        # Validate soil moisture
-        if soil_moisture is not None:
-            if not (limits['soil_moisture']['min'] <= soil_moisture <= limits['soil_moisture']['max']):
-                logging.warning(f"Soil moisture {soil_moisture}% outside valid range")
-        
-        # Validate pressure
-        if pressure is not None:
-            if not (limits['pressure']['min'] <= pressure <= limits['pressure']['max']):
-                logging.warning(f"Pressure {pressure}hPa outside valid range")
-        
-        # Validate light level
-        if light_level is not None:
-            if not (limits['light']['min'] <= light_level <= limits['light']['max']):
-                logging.warning(f"Light level {light_level}% outside valid range")
-        
-        # Validate rain level
-        if rain_level is not None:
-            if not (limits['rain']['min'] <= rain_level <= limits['rain']['max']):
-                logging.warning(f"Rain level {rain_level}% outside valid range")
+    if validation.enabled:
+        limits = validation.limits
+        for label, value, unit, lo, hi in (
+            ('Temperature', temperature, '°C', limits.temp_min, limits.temp_max),  # DHT22 only
+            ('Humidity', humidity, '%', limits.hum_min, limits.hum_max),
+            ('Soil moisture', soil_moisture, '%', limits.soil_min, limits.soil_max),
+            ('Pressure', pressure, 'hPa', limits.pres_min, limits.pres_max),
+            ('Light level', light_level, '%', limits.light_min, limits.light_max),
+            ('Rain level', rain_level, '%', limits.rain_min, limits.rain_max),
+        ):
+            if value is not None and not (lo <= value <= hi):
+                logging.warning(f"{label} {value}{unit} outside valid range")
 
     # Return all readings
     return {
-        'timestamp': datetime.now().strftime(config['logger']['timestamp_format']),
+        'timestamp': format_timestamp(),
         'temperature': temperature,  # °C
         'humidity': humidity,  # %
         'soil_moisture': soil_moisture,  # %
         'light_level': light_level,  # %
         'rain_level': rain_level,  # %
         'pressure': pressure,  # hPa
+        'altitude': calculate_altitude(pressure) if pressure is not None else None,  # m
     }
 
+# Direct I/O CSV file
+class DirectIOFile:
+    """Text file written with O_DIRECT in whole, aligned blocks
+
+    Rows collect in a page-aligned buffer and full blocks are written at
+    aligned offsets, bypassing the page cache. On flush the partial last
+    block is written padded and the file truncated back to its real length;
+    that block stays buffered so the next flush rewrites it with more rows.
+    Flushes with no new rows since the last one write nothing.
+    """
+
+    def __init__(self, path, capacity=CSV_BUFFER_SIZE):
+        # No O_APPEND: it would make the aligned pwrite offsets below ignored
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_DIRECT, 0o644)
+        try:
+            self._buf = mmap.mmap(-1, capacity)  # Anonymous maps are page aligned
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._view = memoryview(self._buf)
+        self._capacity = capacity
+
+        # Start at the block holding the end of the file, keeping its bytes
+        try:
+            size = os.fstat(self._fd).st_size
+            self._offset = size - size % DIRECT_IO_BLOCK_SIZE
+            self._fill = size - self._offset
+            self._dirty = False  # Buffered bytes not yet written to the file
+            if self._fill:
+                with open(path, 'rb') as f:
+                    f.seek(self._offset)
+                    self._buf[:self._fill] = f.read(self._fill)
+        except BaseException:
+            self._view.release()
+            self._buf.close()
+            os.close(self._fd)
+            raise
+
+    def fileno(self):
+        return self._fd
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        pos = 0
+        while pos < len(data):
+            n = min(len(data) - pos, self._capacity - self._fill)
+            self._buf[self._fill:self._fill + n] = data[pos:pos + n]
+            self._fill += n
+            self._dirty = True
+            pos += n
+            if self._fill == self._capacity:
+                os.pwrite(self._fd, self._view, self._offset)
+                self._offset += self._capacity
+                self._fill = 0
+                self._dirty = False
+        return len(text)
+
+    def flush(self):
+        if not self._dirty:
+            return
+        whole = self._fill - self._fill % DIRECT_IO_BLOCK_SIZE
+        tail = self._fill - whole
+        length = whole + (DIRECT_IO_BLOCK_SIZE if tail else 0)
+
+        # Pad the last block, write it whole, then trim the padding off the file
+        self._buf[self._fill:length] = bytes(length - self._fill)
+        os.pwrite(self._fd, self._view[:length], self._offset)
+        if tail:
+            os.ftruncate(self._fd, self._offset + self._fill)
+        self._dirty = False
+
+        # Keep the partial block for the next flush
+        if whole:
+            self._buf[:tail] = self._buf[whole:self._fill]
+            self._offset += whole
+            self._fill = tail
+
+    def close(self):
+        if self._fd < 0:
+            return
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+            self._fd = -1
+            self._view.release()
+            self._buf.close()
+
+# io_uring CSV file
+class IoUring:
+    """Minimal io_uring ring for batched file writes, set up with raw system calls"""
+
+    # System call numbers (shared by all Linux architectures) and ABI constants
+    SYS_SETUP = 425
+    SYS_ENTER = 426
+    SYS_REGISTER = 427
+    OFF_SQ_RING = 0
+    OFF_CQ_RING = 0x8000000
+    OFF_SQES = 0x10000000
+    OP_WRITE = 23
+    SQE_FIXED_FILE = 1 << 0
+    ENTER_GETEVENTS = 1 << 0
+    REGISTER_FILES = 2
+    FEAT_RW_CUR_POS = 1 << 3  # First advertised by 5.6, the kernel that added OP_WRITE
+    SQE_SIZE = 64
+    CQE_SIZE = 16
+
+    def __init__(self, entries):
+        if not sys.platform.startswith('linux'):
+            raise OSError("io_uring requires Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+
+        # struct io_uring_params: 10 u32 fields, then the SQ and CQ ring offsets
+        params = (ctypes.c_uint32 * 30)()
+        self.fd = self._syscall(self.SYS_SETUP, entries, ctypes.addressof(params))
+        try:
+            sq_entries, cq_entries, features = params[0], params[1], params[5]
+            if not features & self.FEAT_RW_CUR_POS:
+                raise OSError("io_uring write support requires Linux 5.6 or newer")
+            sq_off, cq_off = params[10:20], params[20:30]
+
+            self._sq = mmap.mmap(self.fd, sq_off[6] + sq_entries * 4, offset=self.OFF_SQ_RING)
+            self._cq = mmap.mmap(self.fd, cq_off[5] + cq_entries * self.CQE_SIZE, offset=self.OFF_CQ_RING)
+            self._sqes = mmap.mmap(self.fd, sq_entries * self.SQE_SIZE, offset=self.OFF_SQES)
+        except BaseException:
+            os.close(self.fd)
+            raise
+
+        self.entries = sq_entries
+        self._sq_tail = ctypes.c_uint32.from_buffer(self._sq, sq_off[1])
+        self._sq_mask = ctypes.c_uint32.from_buffer(self._sq, sq_off[2]).value
+        self._sq_array = (ctypes.c_uint32 * sq_entries).from_buffer(self._sq, sq_off[6])
+        self._cq_head = ctypes.c_uint32.from_buffer(self._cq, cq_off[0])
+        self._cq_tail = ctypes.c_uint32.from_buffer(self._cq, cq_off[1])
+        self._cq_mask = ctypes.c_uint32.from_buffer(self._cq, cq_off[2]).value
+        self._cqes_off = cq_off[5]
+
+    def _syscall(self, number, *args):
+        result = self._libc.syscall(ctypes.c_long(number), *(ctypes.c_long(a) for a in args))
+        if result < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return result
+
+    def register_file(self, file_fd):
+        """Register file_fd as fixed file 0 so writes skip the per-request fd lookup"""
+        self._fds = (ctypes.c_int32 * 1)(file_fd)
+        self._syscall(self.SYS_REGISTER, self.fd, self.REGISTER_FILES, ctypes.addressof(self._fds), 1)
+
+    def write_batch(self, chunks, offset):
+        """Write byte strings back to back from offset with one submission, return bytes written"""
+        # Without SQPOLL the kernel only reads the ring inside io_uring_enter, so the
+        # system call itself orders these stores before the tail is consumed
+        tail = self._sq_tail.value
+        for i, chunk in enumerate(chunks):
+            index = (tail + i) & self._sq_mask
+            struct.pack_into('=BBHiQQIIQ', self._sqes, index * self.SQE_SIZE,
+                             self.OP_WRITE, self.SQE_FIXED_FILE, 0, 0, offset,
+                             ctypes.cast(ctypes.c_char_p(chunk), ctypes.c_void_p).value,
+                             len(chunk), 0, i)
+            self._sq_array[index] = index
+            offset += len(chunk)
+        self._sq_tail.value = tail + len(chunks)
+
+        # Submit and wait for one completion per chunk; a signal can cut the wait
+        # short, in which case keep waiting without submitting again
+        to_submit = remaining = len(chunks)
+        written = [0] * len(chunks)
+        while remaining:
+            try:
+                to_submit -= self._syscall(self.SYS_ENTER, self.fd, to_submit, remaining,
+                                           self.ENTER_GETEVENTS, 0, 0)
+            except InterruptedError:
+                pass
+            head = self._cq_head.value
+            while head != self._cq_tail.value:
+                user_data, res = struct.unpack_from('=Qi', self._cq,
+                                                    self._cqes_off + (head & self._cq_mask) * self.CQE_SIZE)
+                written[user_data] = res
+                remaining -= 1
+                head += 1
+            self._cq_head.value = head
+        return written
+
+    def close(self):
+        del self._sq_tail, self._sq_array, self._cq_head, self._cq_tail
+        self._sq.close()
+        self._cq.close()
+        self._sqes.close()
+        os.close(self.fd)
+
+class IoUringFile:
+    """Text file appended through io_uring, one write request per row
+
+    Rows are kept until IO_URING_BATCH_SIZE have collected or the file is
+    flushed, then submitted together with a single io_uring_enter call.
+    """
+
+    def __init__(self, path, batch_size=IO_URING_BATCH_SIZE):
+        # No O_APPEND: each row is written at an explicit offset so a batch can
+        # complete in any order
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            self._ring = IoUring(batch_size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        try:
+            self._ring.register_file(self._fd)
+        except BaseException:
+            self._ring.close()
+            os.close(self._fd)
+            raise
+        self._batch_size = min(batch_size, self._ring.entries)
+        self._offset = os.fstat(self._fd).st_size
+        self._pending = []
+
+    def fileno(self):
+        return self._fd
+
+    def write(self, text):
+        self._pending.append(text.encode('utf-8'))
+        if len(self._pending) >= self._batch_size:
+            self._submit()
+        return len(text)
+
+    def _submit(self):
+        pending, self._pending = self._pending, []
+        for chunk, res in zip(pending, self._ring.write_batch(pending, self._offset)):
+            if res < 0:
+                raise OSError(-res, os.strerror(-res))
+            if res < len(chunk):
+                # Short write (e.g. disk full part way); finish it synchronously
+                os.pwrite(self._fd, chunk[res:], self._offset + res)
+            self._offset += len(chunk)
+
+    def flush(self):
+        if self._pending:
+            self._submit()
+
+    def close(self):
+        if self._fd < 0:
+            return
+        try:
+            self.flush()
+        finally:
+            self._ring.close()
+            os.close(self._fd)
+            self._fd = -1
+
+# Daily file preallocation
+def csv_line_bytes(values):
+    """Return the encoded length of values as one CSV line"""
+    return len(','.join(map(str, values)).encode('utf-8')) + 2  # csv ends lines with \r\n
+
+def estimate_csv_bytes(config, day, header):
+    """Estimate the bytes still to be written to day's file, or None if unknown"""
+    log_interval = config['logger']['log_interval']
+    if log_interval <= 0:
+        return None  # Rows are logged back to back, so their count is unknown
+    format_timestamp = make_timestamp_formatter(config['logger']['timestamp_format'])
+    row_bytes = csv_line_bytes([format_timestamp()] + CSV_SAMPLE_VALUES)
+    rows_left = int((next_midnight(day) - time.time()) / log_interval) + 1
+    size = max(rows_left, 1) * row_bytes
+    if header:
+        size += csv_line_bytes(CSV_HEADERS)
+    return size
+
+def preallocate_csv_file(csv_file, size):
+    """Reserve disk space for size more bytes, if given, and hint sequential writes"""
+    fd = csv_file.fileno()
+    offset = os.fstat(fd).st_size
+
+    # os.posix_fallocate would grow the file to size, leaving appended rows
+    # after a run of zero bytes, so call fallocate(2) with FALLOC_FL_KEEP_SIZE
+    try:
+        fallocate = ctypes.CDLL(None, use_errno=True).fallocate64
+    except (OSError, AttributeError):
+        fallocate = None  # Not Linux/glibc
+    if fallocate is not None and size:
+        fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        if fallocate(fd, FALLOC_FL_KEEP_SIZE, offset, size) != 0:
+            err = ctypes.get_errno()
+            logging.debug(f"Could not preallocate {size} bytes for CSV file: {os.strerror(err)}")
+
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+def close_csv_file(csv_file):
+    """Flush and close a CSV file, releasing any space reserved past its end"""
+    try:
+        csv_file.flush()
+        fd = csv_file.fileno()
+        # Truncating to the current length frees the blocks fallocate reserved
+        os.ftruncate(fd, os.fstat(fd).st_size)
+    finally:
+        csv_file.close()
+
 # Setup CSV logging
-def setup_csv_file(config):
-    """Setup CSV file with headers including units"""
+def setup_csv_file(config, day):
+    """Setup the CSV file for day (a time.struct_time) with headers including units"""
     # Expand ~ to user's home directory
     data_folder = os.path.expanduser(config['logger']['data_folder'])
     
     # Create folder if it doesn't exist
     os.makedirs(data_folder, exist_ok=True)
     
-    # Create filename based on current date
-    today = datetime.now().strftime('%Y-%m-%d')
+    # Create filename based on the given date
+    today = time.strftime('%Y-%m-%d', day)
     csv_path = os.path.join(data_folder, f"{today}.csv")
     
-    # Check if file exists to determine if we need to write headers
-    file_exists = os.path.isfile(csv_path)
+    # Write headers unless the file already has content
+    file_exists = os.path.isfile(csv_path) and os.path.getsize(csv_path) > 0
+    
+    # Open file through io_uring or with direct I/O if enabled and supported
+    csv_file = None
+    if config['logger'].get('io_uring', False):
+        try:
+            csv_file = IoUringFile(csv_path)
+        except OSError as e:
+            logging.warning(f"io_uring not available, using buffered writes: {e}")
+    elif config['logger'].get('direct_io', False):
+        if hasattr(os, 'O_DIRECT'):
+            try:
+                csv_file = DirectIOFile(csv_path)
+            except OSError as e:
+                logging.warning(f"Direct I/O not supported for {csv_path}, using buffered writes: {e}")
+        else:
+            logging.warning("Direct I/O not available on this platform, using buffered writes")
     
-    # Open file in append mode
-    csv_file = open(csv_path, 'a', newline='')
-    csv_writer = csv.writer(csv_file)
+    # Otherwise open file in append mode, buffering rows until the next flush
+    if csv_file is None:
+        csv_file = open(csv_path, 'a', buffering=CSV_BUFFER_SIZE, newline='')
+    
+    try:
+        csv_writer = csv.writer(csv_file)
+        
+        # Write headers if file is new
+        if not file_exists:
+            csv_writer.writerow(CSV_HEADERS)
+    except BaseException:
+        csv_file.close()
+        raise
     
-    # Write headers if file is new
-    if not file_exists:
-        headers = [
-            'Timestamp',
-            'Temperature (°C)',
-            'Humidity (%)',
-            'Soil Moisture (%)',
-            'Light Level (%)',
-            'Rain Level (%)',
-            'Pressure (hPa)',
-            'Altitude (m)'
-        ]
-        csv_writer.writerow(headers)
+    # Reserve space for the rest of the day's rows up front; skipped for
+    # direct I/O, whose flushes truncate the file and would release the
+    # reservation. Whatever is left unused is freed when the file is closed.
+    # This is only a hint, so a failure never stops rows being logged
+    if not isinstance(csv_file, DirectIOFile):
+        try:
+            preallocate_csv_file(csv_file, estimate_csv_bytes(config, day, not file_exists))
+        except Exception as e:
+            logging.debug(f"Could not preallocate CSV file {csv_path}: {e}")
     
     return csv_file, csv_writer
 
+# Daily file rollover
+def next_midnight(lt):
+    """Return the epoch time of the local midnight following lt (a time.struct_time)"""
+    # mktime normalises the day overflow and works out DST with isdst=-1
+    return time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+# Background CSV writer
+class CsvWriterThread(threading.Thread):
+    """Write queued rows to the daily CSV file off the sampling thread"""
+
+    def __init__(self, config):
+        super().__init__(name='csv-writer', daemon=True)
+        self.config = config
+        self.queue = queue.Queue(maxsize=CSV_QUEUE_SIZE)
+        self.flush_interval = config['logger'].get('flush_interval', DEFAULT_FLUSH_INTERVAL)
+        self._row_buf = []
+
+    def put(self, row):
+        """Queue a row for writing without blocking the caller"""
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            logging.warning("CSV write queue full, dropping row")
+
+    def stop(self):
+        """Write out all queued rows, close the file and wait for the thread"""
+        if not self.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=CSV_STOP_TIMEOUT)
+        except queue.Full:
+            logging.error("CSV writer not draining its queue, abandoning queued rows")
+            return
+        self.join(CSV_STOP_TIMEOUT)
+
+    def _write_rows(self, csv_writer):
+        """Encode the collected rows with a single writerows call"""
+        if self._row_buf:
+            csv_writer.writerows(self._row_buf)
+            self._row_buf.clear()
+
+    def run(self):
+        csv_file = None
+        csv_writer = None
+        next_rollover = 0.0
+        last_flush = time.monotonic()
+        unflushed = False  # Rows written or collected since the last flush
+
+        try:
+            while True:
+                # Wake for the next flush only while rows are waiting for it;
+                # otherwise block, so an idle writer (or flush_interval 0) can't spin
+                try:
+                    row = self.queue.get(timeout=self.flush_interval if unflushed else None)
+                except queue.Empty:
+                    row = ()
+
+                # None is the shutdown sentinel queued by stop()
+                if row is None:
+                    break
+
+                try:
+                    if row:
+                        # Check if we need a new CSV file (day changed)
+                        if time.time() >= next_rollover:
+                            # Write out the previous day's rows and close its file
+                            if csv_file:
+                                self._write_rows(csv_writer)
+                                close_csv_file(csv_file)
+                                csv_file = None
+
+                            # Create new CSV file for the day, taking its name and
+                            # the next rollover from one clock reading so a
+                            # midnight passing during setup can't skip a day
+                            today = time.localtime()
+                            csv_file, csv_writer = setup_csv_file(self.config, today)
+                            next_rollover = next_midnight(today)
+                            logging.info(f"Created new log file for {time.strftime('%Y-%m-%d', today)}")
+
+                        self._row_buf.append(row)
+                        unflushed = True
+                        if len(self._row_buf) >= CSV_BATCH_SIZE:
+                            self._write_rows(csv_writer)
+
+                    # Write and flush collected rows once the flush interval has elapsed
+                    now = time.monotonic()
+                    if unflushed and now - last_flush >= self.flush_interval:
+                        self._write_rows(csv_writer)
+                        csv_file.flush()
+                        last_flush = now
+                        unflushed = False
+
+                except Exception as e:
+                    # Keep the thread alive; the file is reopened for the next row
+                    logging.error(f"Error writing CSV file, dropping {len(self._row_buf) or 1} row(s): {e}")
+                    self._row_buf.clear()
+                    unflushed = False
+                    if csv_file:
+                        try:
+                            close_csv_file(csv_file)
+                        except Exception:
+                            pass
+                    csv_file = None
+                    next_rollover = 0.0
+
+        except Exception as e:
+            logging.error(f"Error in CSV writer: {e}")
+
+        finally:
+            # Write out collected rows; closing flushes them to the file
+            if csv_file:
+                try:
+                    self._write_rows(csv_writer)
+                finally:
+                    close_csv_file(csv_file)
+
 # Log data to CSV
 def log_data(csv_writer, data):
-    """Write sensor data to CSV file"""
+    """Queue sensor data for the CSV writer thread"""
     row = [
         data['timestamp'],
         data['temperature'],
@@ -323,9 +989,10 @@ def log_data(csv_writer, data):
         data['soil_moisture'],
         data['light_level'],
         data['rain_level'],
-        data['pressure']
+        data['pressure'],
+        data['altitude']
     ]
-    csv_writer.writerow(row)
+    csv_writer.put(row)
 
 # Signal handler for graceful shutdown
 def signal_handler(sig, frame):
@@ -343,55 +1010,63 @@ def main():
     
     # Initialize hardware
     try:
-        spi, dht_sensor, bus = initialize_hardware()
+        spi, dht_sensor, bmp = initialize_hardware()
         logging.info("Hardware initialized successfully")
     except Exception as e:
         logging.error(f"Failed to initialize hardware: {e}")
         sys.exit(1)
     
+    # Compile the BMP180 maths before the first reading
+    warm_up_bmp180()
+    
     # Setup signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    # Start the CSV writer thread
+    csv_writer = CsvWriterThread(config)
+    csv_writer.start()
+
+    # Settings used on every cycle
+    validation = load_validation(config)
+    retry = load_retry(config)
+    workers = SensorWorkers(analog=SensorWorker('analog'), dht22=SensorWorker('dht22'))
+    format_timestamp = make_timestamp_formatter(config['logger']['timestamp_format'])
+    log_interval = config['logger']['log_interval']
+    
     # Main loop
-    csv_file = None
-    csv_writer = None
-    last_day = None
+    loop = asyncio.new_event_loop()
     
     try:
         while True:
-            # Check if we need a new CSV file (day changed)
-            today = datetime.now().day
-            if last_day != today:
-                # Close previous file if open
-                if csv_file:
-                    csv_file.close()
-                
-                # Create new CSV file for the day
-                csv_file, csv_writer = setup_csv_file(config)
-                last_day = today
-                logging.info(f"Created new log file for {datetime.now().strftime('%Y-%m-%d')}")
+            # Stop if the CSV writer has died, as nothing would record the readings
+            if not csv_writer.is_alive():
+                logging.error("CSV writer thread stopped, shutting down")
+                break
             
             # Read all sensors
-            sensor_data = read_all_sensors(spi, dht_sensor, bus, config)
+            sensor_data = loop.run_until_complete(read_all_sensors(spi, dht_sensor, bmp, validation, format_timestamp, retry, workers))
             
-            # Log data to CSV
+            # Queue data for the CSV writer
             log_data(csv_writer, sensor_data)
             logging.debug(f"Logged data: {sensor_data}")
             
-            # Flush to ensure data is written
-            csv_file.flush()
-            
             # Wait for next logging interval
-            time.sleep(config['logger']['log_interval'])
+            time.sleep(log_interval)
     
     except Exception as e:
         logging.error(f"Error in main loop: {e}")
     
     finally:
         # Clean up
-        if csv_file:
-            csv_file.close()
+        csv_writer.stop()
+        # A signal can land mid-cycle; cancel the interrupted reads before closing
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
         spi.close()
         logging.info("Data logger shutdown complete")
 
@@ -46,6 +46,12 @@ pip install board
 pip install spidev
 pip install RPi.GPIO
 pip install smbus
+pip install numba || echo "numba not available, BMP180 calculations will run as plain Python"
+pip install cython
+
+# Build the compiled BMP180 calculations (optional, data_logger.py falls back to Python)
+echo "\nBuilding BMP180 extension..."
+CFLAGS="-O3 -march=native" cythonize -i _bmp180.pyx || echo "BMP180 extension build failed, using the Python implementation"
 
 # Create data directory from config
 DATA_DIR=$(python3 -c "import json; print(json.load(open('sensor_logger.json'))['logger']['data_folder'])")